@@ -127,5 +127,8 @@ def load_handler(dummy):
             action.psa_export.fps = action['psa_sequence_fps']
             del action['psa_sequence_fps']
 
+    # The cached PSA export sequence data is keyed by pointers, which may be reused by the data of the loaded file.
+    psa_export_properties.clear_sequence_list_caches()
+
 
 bpy.app.handlers.load_post.append(load_handler)
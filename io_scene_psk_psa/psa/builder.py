@@ -8,17 +8,22 @@ from ..shared.helpers import *
 
 class PsaBuildSequence:
     class NlaState:
-        def __init__(self):
-            self.action: Optional[Action] = None
-            self.frame_start: int = 0
-            self.frame_end: int = 0
-
-    def __init__(self):
-        self.name: str = ''
-        self.nla_state: PsaBuildSequence.NlaState = PsaBuildSequence.NlaState()
-        self.compression_ratio: float = 1.0
-        self.key_quota: int = 0
-        self.fps: float = 30.0
+        __slots__ = ('action', 'frame_start', 'frame_end')
+
+        def __init__(self, action: Optional[Action] = None, frame_start: int = 0, frame_end: int = 0):
+            self.action: Optional[Action] = action
+            self.frame_start: int = frame_start
+            self.frame_end: int = frame_end
+
+    __slots__ = ('name', 'nla_state', 'compression_ratio', 'key_quota', 'fps')
+
+    def __init__(self, name: str = '', nla_state: Optional['PsaBuildSequence.NlaState'] = None,
+                 compression_ratio: float = 1.0, key_quota: int = 0, fps: float = 30.0):
+        self.name: str = name
+        self.nla_state: PsaBuildSequence.NlaState = nla_state if nla_state is not None else PsaBuildSequence.NlaState()
+        self.compression_ratio: float = compression_ratio
+        self.key_quota: int = key_quota
+        self.fps: float = fps
 
 
 class PsaBuildOptions:
@@ -1,111 +1,180 @@
 import re
-from collections import Counter
-from typing import List, Iterable, Dict, Tuple
+import sys
+from functools import lru_cache
+from operator import attrgetter
+from typing import List, Iterable, Iterator, Dict, Tuple, Callable, FrozenSet, Optional
 
 import bpy
+import numpy as np
 from bpy.props import StringProperty
 from bpy.types import Context, Armature, Action, Object, AnimData, TimelineMarker
 from bpy_extras.io_utils import ExportHelper
 from bpy_types import Operator
 
-from .properties import PSA_PG_export, PSA_PG_export_action_list_item, filter_sequences
+from .properties import PSA_PG_export, PSA_PG_export_action_list_item, get_sequence_filter, \
+    clear_sequence_list_caches
 from ..builder import build_psa, PsaBuildSequence, PsaBuildOptions
 from ..writer import write_psa
-from ...shared.helpers import populate_bone_collection_list, get_nla_strips_in_frame_range
+from ...shared.helpers import populate_bone_collection_list, get_unmuted_nla_tracks, NlaStripFrameRangeIndex
 
 
-def is_action_for_armature(armature: Armature, action: Action):
-    if len(action.fcurves) == 0:
-        return False
-    bone_names = set([x.name for x in armature.bones])
+POSE_BONE_DATA_PATH_PREFIX = 'pose.bones["'
+REVERSED_SEQUENCE_NAME_PATTERN = re.compile(r'(.+)/(.+)')
+
+# The names of the sequence list and list index properties on PSA_PG_export for each sequence source.
+SEQUENCE_LIST_PROPNAMES = {
+    'ACTIONS': ('action_list', 'action_list_index'),
+    'TIMELINE_MARKERS': ('marker_list', 'marker_list_index'),
+    'NLA_TRACK_STRIPS': ('nla_strip_list', 'nla_strip_list_index'),
+}
+
+
+def get_action_bone_names(action: Action) -> FrozenSet[str]:
+    """
+    Returns the names of all the bones that are animated by the action's f-curves.
+    """
+    bone_names = set()
+    bone_name_start = len(POSE_BONE_DATA_PATH_PREFIX)
     for fcurve in action.fcurves:
-        match = re.match(r'pose\.bones\[\"([^\"]+)\"](\[\"([^\"]+)\"])?', fcurve.data_path)
-        if not match:
+        data_path = fcurve.data_path
+        if not data_path.startswith(POSE_BONE_DATA_PATH_PREFIX):
             continue
-        bone_name = match.group(1)
-        if bone_name in bone_names:
-            return True
-    return False
+        # The bone name runs from the end of the prefix up to the closing quote (e.g., `pose.bones["Name"].location`).
+        bone_name_end = data_path.find('"', bone_name_start)
+        if bone_name_end <= bone_name_start:
+            continue
+        # The names are interned so that comparing them against the (also interned) armature bone names is an identity
+        # check.
+        bone_names.add(sys.intern(data_path[bone_name_start:bone_name_end]))
+    return frozenset(bone_names)
 
 
 def update_actions_and_timeline_markers(context: Context, armature: Armature):
     pg = getattr(context.scene, 'psa_export')
 
-    # Clear actions and markers.
-    pg.action_list.clear()
-    pg.marker_list.clear()
-
     # Get animation data.
-    animation_data_object = get_animation_data_object(context)
+    animation_data_object = get_animation_data_object(context, pg)
     animation_data = animation_data_object.animation_data if animation_data_object else None
 
+    clear_sequence_list_caches()
+
     if animation_data is None:
+        pg.action_list.clear()
+        pg.marker_list.clear()
         return
 
+    # Gather the items for both lists before touching the collections, so that they can be written in one pass.
+    action_list_items: List[Tuple[Action, str, bool, int, int]] = []
+    marker_list_items: List[Tuple[str, int, int]] = []
+
     # Populate actions list.
+    bone_names = frozenset(sys.intern(x.name) for x in armature.bones)
     for action in bpy.data.actions:
-        if not is_action_for_armature(armature, action):
+        # Actions without f-curves can never be for this armature.
+        if len(action.fcurves) == 0:
             continue
+        if bone_names.isdisjoint(get_action_bone_names(action)):
+            continue
+        action_name = action.name
+
+        # Computing the frame range of an action means evaluating all of its f-curves, so only do it once.
+        action_frame_start, action_frame_end = (int(x) for x in action.frame_range)
 
-        if action.name != '' and not action.name.startswith('#'):
-            for (name, frame_start, frame_end) in get_sequences_from_action(action):
-                item = pg.action_list.add()
-                item.action = action
-                item.name = name
-                item.is_selected = False
-                item.is_pose_marker = False
-                item.frame_start = frame_start
-                item.frame_end = frame_end
+        if action_name != '' and not action_name.startswith('#'):
+            for (name, frame_start, frame_end) in get_sequences_from_name_and_frame_range(action_name, action_frame_start, action_frame_end):
+                action_list_items.append((action, name, False, frame_start, frame_end))
+
+        # Most actions have no pose markers, so don't bother sorting them.
+        if len(action.pose_markers) == 0:
+            continue
 
         # Pose markers are not guaranteed to be in frame-order, so make sure that they are.
-        pose_markers = sorted(action.pose_markers, key=lambda x: x.frame)
-        for pose_marker_index, pose_marker in enumerate(pose_markers):
-            if pose_marker.name.strip() == '' or pose_marker.name.startswith('#'):
+        pose_markers = sorted(action.pose_markers, key=attrgetter('frame'))
+        # Each pose marker sequence ends at the next pose marker, or at the end of the action for the last one.
+        pose_marker_frame_ends = [x.frame for x in pose_markers[1:]] + [action_frame_end]
+        for pose_marker, pose_marker_frame_end in zip(pose_markers, pose_marker_frame_ends):
+            pose_marker_name = pose_marker.name
+            if not pose_marker_name or pose_marker_name.isspace() or pose_marker_name.startswith('#'):
                 continue
-            for (name, frame_start, frame_end) in get_sequences_from_action_pose_markers(action, pose_markers, pose_marker, pose_marker_index):
-                item = pg.action_list.add()
-                item.action = action
-                item.name = name
-                item.is_selected = False
-                item.is_pose_marker = True
-                item.frame_start = frame_start
-                item.frame_end = frame_end
+            for (name, frame_start, frame_end) in get_sequences_from_pose_marker(pose_marker_name, pose_marker.frame, pose_marker_frame_end):
+                action_list_items.append((action, name, True, frame_start, frame_end))
 
     # Populate timeline markers list.
-    marker_names = [x.name for x in context.scene.timeline_markers]
-    sequence_frame_ranges = get_timeline_marker_sequence_frame_ranges(animation_data, context, marker_names)
+    timeline_markers = context.scene.timeline_markers
+    sequence_frame_ranges = get_timeline_marker_sequence_frame_ranges(animation_data, timeline_markers)
+    marker_names = [x.name for x in timeline_markers]
 
     for marker_name in marker_names:
         if marker_name not in sequence_frame_ranges:
             continue
-        if marker_name.strip() == '' or marker_name.startswith('#'):
+        if not marker_name or marker_name.isspace() or marker_name.startswith('#'):
             continue
         frame_start, frame_end = sequence_frame_ranges[marker_name]
         sequences = get_sequences_from_name_and_frame_range(marker_name, frame_start, frame_end)
-        for (sequence_name, frame_start, frame_end) in sequences:
-            item = pg.marker_list.add()
-            item.name = sequence_name
-            item.is_selected = False
-            item.frame_start = frame_start
-            item.frame_end = frame_end
+        marker_list_items.extend(sequences)
 
+    # Write the lists. Every item starts out unselected.
+    # Pointer and string properties have to be assigned per item, but everything else is written with foreach_set.
+    pg.action_list.clear()
+    add_action_list_item = pg.action_list.add
+    for (action, name, _, _, _) in action_list_items:
+        item = add_action_list_item()
+        item.action = action
+        item.name = name
+    pg.action_list.foreach_set('is_selected', [False] * len(action_list_items))
+    pg.action_list.foreach_set('is_pose_marker', [x[2] for x in action_list_items])
+    pg.action_list.foreach_set('frame_start', [x[3] for x in action_list_items])
+    pg.action_list.foreach_set('frame_end', [x[4] for x in action_list_items])
 
-def get_sequence_fps(context: Context, fps_source: str, fps_custom: float, actions: Iterable[Action]) -> float:
+    pg.marker_list.clear()
+    add_marker_list_item = pg.marker_list.add
+    for (name, _, _) in marker_list_items:
+        add_marker_list_item().name = name
+    pg.marker_list.foreach_set('is_selected', [False] * len(marker_list_items))
+    pg.marker_list.foreach_set('frame_start', [x[1] for x in marker_list_items])
+    pg.marker_list.foreach_set('frame_end', [x[2] for x in marker_list_items])
+
+
+def get_fixed_fps(context: Context, fps_source: str, fps_custom: float) -> Optional[float]:
+    """
+    Returns the FPS that every sequence is exported with for the FPS source, or None if the FPS depends on the actions
+    that contribute to each sequence.
+    """
     match fps_source:
         case 'SCENE':
             return context.scene.render.fps
         case 'CUSTOM':
             return fps_custom
         case 'ACTION_METADATA':
-            # Get the minimum value of action metadata FPS values.
-            return min([action.psa_export.fps for action in actions])
+            return None
         case _:
             raise RuntimeError(f'Invalid FPS source "{fps_source}"')
 
 
-def get_animation_data_object(context: Context) -> Object:
-    pg: PSA_PG_export = getattr(context.scene, 'psa_export')
+def get_sequence_fps_getter(context: Context, fps_source: str, fps_custom: float) -> Callable[[Iterable[Action]], float]:
+    """
+    Returns a function that calculates the FPS of a sequence from the actions that contribute to it.
+    The FPS source is resolved once here so that it doesn't need to be dispatched again for every sequence.
+    """
+    fps = get_fixed_fps(context, fps_source, fps_custom)
+    if fps is not None:
+        return lambda actions: fps
+    # Get the minimum value of action metadata FPS values.
+    return lambda actions: min([action.psa_export.fps for action in actions])
+
+
+def get_action_fps_getter(context: Context, fps_source: str, fps_custom: float) -> Callable[[Action], float]:
+    """
+    Same as get_sequence_fps_getter, but for sequences that only have a single contributing action, which spares
+    building a list and reducing it with min for every sequence.
+    """
+    fps = get_fixed_fps(context, fps_source, fps_custom)
+    if fps is not None:
+        return lambda action: fps
+    return lambda action: action.psa_export.fps
 
+
+def get_animation_data_object(context: Context, pg: PSA_PG_export) -> Object:
     active_object = context.view_layer.objects.active
 
     if active_object.type != 'ARMATURE':
@@ -127,38 +196,53 @@ def is_bone_filter_mode_item_available(context, identifier):
     return True
 
 
-def get_timeline_marker_sequence_frame_ranges(animation_data: AnimData, context: Context, marker_names: List[str]) -> Dict:
-    # Timeline markers need to be sorted so that we can determine the sequence start and end positions.
-    sequence_frame_ranges = dict()
-    sorted_timeline_markers = list(sorted(context.scene.timeline_markers, key=lambda x: x.frame))
-    sorted_timeline_marker_names = list(map(lambda x: x.name, sorted_timeline_markers))
+def get_sorted_timeline_markers(timeline_markers) -> List[TimelineMarker]:
+    # Fetch all the marker frames in a single call instead of reading each marker's frame during the sort.
+    timeline_marker_frames = np.empty(len(timeline_markers), dtype=np.int32)
+    timeline_markers.foreach_get('frame', timeline_marker_frames)
+    timeline_markers = list(timeline_markers)
+    return [timeline_markers[i] for i in np.argsort(timeline_marker_frames, kind='stable')]
 
-    for marker_name in marker_names:
-        marker = context.scene.timeline_markers[marker_name]
-        frame_start = marker.frame
+
+def get_timeline_marker_sequence_frame_ranges(animation_data: AnimData, timeline_markers) -> Dict:
+    """
+    Returns the frame range of the sequence delineated by each timeline marker, keyed by marker name.
+
+    When marker names are duplicated, the sequence starts at the first marker with that name in the collection (i.e.,
+    `timeline_markers[name]`) and ends at the marker that follows the first marker with that name in frame order.
+    """
+    sequence_frame_ranges = dict()
+    # Timeline markers need to be sorted so that we can determine the sequence start and end positions.
+    sorted_timeline_markers = get_sorted_timeline_markers(timeline_markers)
+    sorted_timeline_marker_frames = [x.frame for x in sorted_timeline_markers]
+    sorted_timeline_marker_indices = dict()
+    for marker_index, marker in enumerate(sorted_timeline_markers):
+        sorted_timeline_marker_indices.setdefault(marker.name, marker_index)
+    marker_frames = dict()
+    for marker in timeline_markers:
+        marker_frames.setdefault(marker.name, marker.frame)
+    nla_strip_index = NlaStripFrameRangeIndex(get_unmuted_nla_tracks(animation_data))
+    # The final frame of all the NLA strips, used as the end of the sequence for the last marker.
+    nla_strips_frame_end = float(nla_strip_index.frame_ends.max(initial=0))
+
+    for marker_name, marker_frame in marker_frames.items():
+        frame_start = marker_frame
         # Determine the final frame of the sequence based on the next marker.
         # If no subsequent marker exists, use the maximum frame_end from all NLA strips.
-        marker_index = sorted_timeline_marker_names.index(marker_name)
-        next_marker_index = marker_index + 1
-        frame_end = 0
+        next_marker_index = sorted_timeline_marker_indices[marker_name] + 1
         if next_marker_index < len(sorted_timeline_markers):
             # There is a next marker. Use that next marker's frame position as the last frame of this sequence.
-            frame_end = sorted_timeline_markers[next_marker_index].frame
-            nla_strips = get_nla_strips_in_frame_range(animation_data, marker.frame, frame_end)
-            if len(nla_strips) > 0:
-                frame_end = min(frame_end, max(map(lambda nla_strip: nla_strip.frame_end, nla_strips)))
-                frame_start = max(frame_start, min(map(lambda nla_strip: nla_strip.frame_start, nla_strips)))
+            frame_end = sorted_timeline_marker_frames[next_marker_index]
+            nla_strips_frame_range = nla_strip_index.get_frame_range_extents(marker_frame, frame_end)
+            if nla_strips_frame_range is not None:
+                frame_end = min(frame_end, nla_strips_frame_range[1])
+                frame_start = max(frame_start, nla_strips_frame_range[0])
             else:
                 # No strips in between this marker and the next, just export this as a one-frame animation.
                 frame_end = frame_start
         else:
             # There is no next marker.
-            # Find the final frame of all the NLA strips and use that as the last frame of this sequence.
-            for nla_track in animation_data.nla_tracks:
-                if nla_track.mute:
-                    continue
-                for strip in nla_track.strips:
-                    frame_end = max(frame_end, strip.frame_end)
+            frame_end = nla_strips_frame_end
 
         if frame_start > frame_end:
             continue
@@ -168,12 +252,23 @@ def get_timeline_marker_sequence_frame_ranges(animation_data: AnimData, context:
     return sequence_frame_ranges
 
 
+@lru_cache(maxsize=4096)
+def split_reversed_sequence_name(name: str) -> Optional[Tuple[str, str]]:
+    """
+    Splits a sequence name of the form `forward/backwards` into its forward and backwards names, or returns None if the
+    name does not describe a reversed sequence.
+    The same names are parsed on every rebuild of the sequence lists, so the results are cached.
+    """
+    reversed_match = REVERSED_SEQUENCE_NAME_PATTERN.match(name)
+    if reversed_match is None:
+        return None
+    return reversed_match.group(1), reversed_match.group(2)
+
+
 def get_sequences_from_name_and_frame_range(name: str, frame_start: int, frame_end: int) -> List[Tuple[str, int, int]]:
-    reversed_pattern = r'(.+)/(.+)'
-    reversed_match = re.match(reversed_pattern, name)
-    if reversed_match:
-        forward_name = reversed_match.group(1)
-        backwards_name = reversed_match.group(2)
+    reversed_names = split_reversed_sequence_name(name)
+    if reversed_names is not None:
+        forward_name, backwards_name = reversed_names
         return [
             (forward_name, frame_start, frame_end),
             (backwards_name, frame_end, frame_start)
@@ -182,32 +277,35 @@ def get_sequences_from_name_and_frame_range(name: str, frame_start: int, frame_e
         return [(name, frame_start, frame_end)]
 
 
-def get_sequences_from_action(action: Action) -> List[Tuple[str, int, int]]:
-    frame_start = int(action.frame_range[0])
-    frame_end = int(action.frame_range[1])
-    return get_sequences_from_name_and_frame_range(action.name, frame_start, frame_end)
+def get_sequences_from_pose_marker(name: str, frame_start: int, frame_end: int) -> List[Tuple[str, int, int]]:
+    if name.startswith('!'):
+        # If the pose marker name starts with an exclamation mark, only export the first frame.
+        return get_sequences_from_name_and_frame_range(name[1:], frame_start, frame_start)
+    return get_sequences_from_name_and_frame_range(name, frame_start, frame_end)
 
 
-def get_sequences_from_action_pose_markers(action: Action, pose_markers: List[TimelineMarker], pose_marker: TimelineMarker, pose_marker_index: int) -> List[Tuple[str, int, int]]:
-    frame_start = pose_marker.frame
-    sequence_name = pose_marker.name
-    if pose_marker.name.startswith('!'):
-        # If the pose marker name starts with an exclamation mark, only export the first frame.
-        frame_end = frame_start
-        sequence_name = sequence_name[1:]
-    elif pose_marker_index + 1 < len(pose_markers):
-        frame_end = pose_markers[pose_marker_index + 1].frame
-    else:
-        frame_end = int(action.frame_range[1])
-    return get_sequences_from_name_and_frame_range(sequence_name, frame_start, frame_end)
+def get_sequence_list(pg: PSA_PG_export):
+    return getattr(pg, SEQUENCE_LIST_PROPNAMES[pg.sequence_source][0])
+
 
+def iter_visible_sequences(pg: PSA_PG_export, sequences) -> Iterator[PSA_PG_export_action_list_item]:
+    _, visible_indices = get_sequence_filter(pg, sequences)
+    return (sequences[i] for i in visible_indices)
 
-def get_visible_sequences(pg: PSA_PG_export, sequences) -> List[PSA_PG_export_action_list_item]:
-    visible_sequences = []
-    for i, flag in enumerate(filter_sequences(pg, sequences)):
-        if bool(flag & (1 << 30)):
-            visible_sequences.append(sequences[i])
-    return visible_sequences
+
+def set_visible_sequences_is_selected(pg: PSA_PG_export, sequences, is_selected: bool):
+    _, visible_indices = get_sequence_filter(pg, sequences)
+    if len(visible_indices) == len(sequences):
+        # Nothing is filtered out, so the whole collection can be written in a single call.
+        sequences.foreach_set('is_selected', [is_selected] * len(sequences))
+    else:
+        # Read the whole selection state, change the visible items and write it all back, instead of writing to each
+        # visible item individually.
+        is_selected_flags = [False] * len(sequences)
+        sequences.foreach_get('is_selected', is_selected_flags)
+        for i in visible_indices:
+            is_selected_flags[i] = is_selected
+        sequences.foreach_set('is_selected', is_selected_flags)
 
 
 class PSA_OT_export(Operator, ExportHelper):
@@ -266,16 +364,10 @@ class PSA_OT_export(Operator, ExportHelper):
             row.operator(PSA_OT_export_actions_select_all.bl_idname, text='All', icon='CHECKBOX_HLT')
             row.operator(PSA_OT_export_actions_deselect_all.bl_idname, text='None', icon='CHECKBOX_DEHLT')
 
-            # ACTIONS
-            if pg.sequence_source == 'ACTIONS':
-                rows = max(3, min(len(pg.action_list), 10))
-                sequences_panel.template_list('PSA_UL_export_sequences', '', pg, 'action_list', pg, 'action_list_index', rows=rows)
-            elif pg.sequence_source == 'TIMELINE_MARKERS':
-                rows = max(3, min(len(pg.marker_list), 10))
-                sequences_panel.template_list('PSA_UL_export_sequences', '', pg, 'marker_list', pg, 'marker_list_index', rows=rows)
-            elif pg.sequence_source == 'NLA_TRACK_STRIPS':
-                rows = max(3, min(len(pg.nla_strip_list), 10))
-                sequences_panel.template_list('PSA_UL_export_sequences', '', pg, 'nla_strip_list', pg, 'nla_strip_list_index', rows=rows)
+            # SEQUENCES
+            propname, active_propname = SEQUENCE_LIST_PROPNAMES[pg.sequence_source]
+            rows = max(3, min(len(getattr(pg, propname)), 10))
+            sequences_panel.template_list('PSA_UL_export_sequences', '', pg, propname, pg, active_propname, rows=rows)
 
             flow = sequences_panel.grid_flow()
             flow.use_property_split = True
@@ -284,13 +376,15 @@ class PSA_OT_export(Operator, ExportHelper):
             flow.prop(pg, 'sequence_name_suffix')
 
             # Determine if there is going to be a naming conflict and display an error, if so.
-            selected_items = [x for x in pg.action_list if x.is_selected]
-            action_names = [x.name for x in selected_items]
-            action_name_counts = Counter(action_names)
-            for action_name, count in action_name_counts.items():
-                if count > 1:
+            selected_action_names = set()
+            for x in pg.action_list:
+                if not x.is_selected:
+                    continue
+                action_name = x.name
+                if action_name in selected_action_names:
                     layout.label(text=f'Duplicate action: {action_name}', icon='ERROR')
                     break
+                selected_action_names.add(action_name)
 
             # FPS
             flow.prop(pg, 'fps_source')
@@ -341,6 +435,7 @@ class PSA_OT_export(Operator, ExportHelper):
             self._check_context(context)
         except RuntimeError as e:
             self.report({'ERROR_INVALID_CONTEXT'}, str(e))
+            return {'CANCELLED'}
 
         pg: PSA_PG_export = getattr(context.scene, 'psa_export')
 
@@ -361,61 +456,63 @@ class PSA_OT_export(Operator, ExportHelper):
 
     def execute(self, context):
         pg = getattr(context.scene, 'psa_export')
+        sequence_source = pg.sequence_source
+        fps_source = pg.fps_source
+        fps_custom = pg.fps_custom
 
         # Ensure that we actually have items that we are going to be exporting.
-        if pg.sequence_source == 'ACTIONS' and len(pg.action_list) == 0:
+        if sequence_source == 'ACTIONS' and len(pg.action_list) == 0:
             raise RuntimeError('No actions were selected for export')
-        elif pg.sequence_source == 'TIMELINE_MARKERS' and len(pg.marker_list) == 0:
+        elif sequence_source == 'TIMELINE_MARKERS' and len(pg.marker_list) == 0:
             raise RuntimeError('No timeline markers were selected for export')
-        elif pg.sequence_source == 'NLA_TRACK_STRIPS' and len(pg.nla_strip_list) == 0:
+        elif sequence_source == 'NLA_TRACK_STRIPS' and len(pg.nla_strip_list) == 0:
             raise RuntimeError('No NLA track strips were selected for export')
 
         # Populate the export sequence list.
-        animation_data_object = get_animation_data_object(context)
+        animation_data_object = get_animation_data_object(context, pg)
         animation_data = animation_data_object.animation_data
 
         if animation_data is None:
             raise RuntimeError(f'No animation data for object \'{animation_data_object.name}\'')
 
         export_sequences: List[PsaBuildSequence] = []
+        get_sequence_fps = get_sequence_fps_getter(context, fps_source, fps_custom)
+        get_action_fps = get_action_fps_getter(context, fps_source, fps_custom)
 
-        if pg.sequence_source == 'ACTIONS':
+        if sequence_source == 'ACTIONS':
             for action_item in filter(lambda x: x.is_selected, pg.action_list):
-                if len(action_item.action.fcurves) == 0:
+                action = action_item.action
+                if len(action.fcurves) == 0:
                     continue
-                export_sequence = PsaBuildSequence()
-                export_sequence.nla_state.action = action_item.action
-                export_sequence.name = action_item.name
-                export_sequence.nla_state.frame_start = action_item.frame_start
-                export_sequence.nla_state.frame_end = action_item.frame_end
-                export_sequence.fps = get_sequence_fps(context, pg.fps_source, pg.fps_custom, [action_item.action])
-                export_sequence.compression_ratio = action_item.action.psa_export.compression_ratio
-                export_sequence.key_quota = action_item.action.psa_export.key_quota
-                export_sequences.append(export_sequence)
-        elif pg.sequence_source == 'TIMELINE_MARKERS':
+                action_psa_export = action.psa_export
+                export_sequences.append(PsaBuildSequence(
+                    name=action_item.name,
+                    nla_state=PsaBuildSequence.NlaState(action, action_item.frame_start, action_item.frame_end),
+                    fps=get_action_fps(action),
+                    compression_ratio=action_psa_export.compression_ratio,
+                    key_quota=action_psa_export.key_quota))
+        elif sequence_source == 'TIMELINE_MARKERS':
+            nla_strip_index = NlaStripFrameRangeIndex(get_unmuted_nla_tracks(animation_data))
             for marker_item in filter(lambda x: x.is_selected, pg.marker_list):
-                export_sequence = PsaBuildSequence()
-                export_sequence.name = marker_item.name
-                export_sequence.nla_state.action = None
-                export_sequence.nla_state.frame_start = marker_item.frame_start
-                export_sequence.nla_state.frame_end = marker_item.frame_end
-                nla_strips_actions = set(
-                    map(lambda x: x.action, get_nla_strips_in_frame_range(animation_data, marker_item.frame_start, marker_item.frame_end)))
-                export_sequence.fps = get_sequence_fps(context, pg.fps_source, pg.fps_custom, nla_strips_actions)
-                export_sequences.append(export_sequence)
-        elif pg.sequence_source == 'NLA_TRACK_STRIPS':
+                frame_start = marker_item.frame_start
+                frame_end = marker_item.frame_end
+                nla_strips_actions = nla_strip_index.get_actions_in_frame_range(frame_start, frame_end)
+                export_sequences.append(PsaBuildSequence(
+                    name=marker_item.name,
+                    nla_state=PsaBuildSequence.NlaState(None, frame_start, frame_end),
+                    fps=get_sequence_fps(nla_strips_actions)))
+        elif sequence_source == 'NLA_TRACK_STRIPS':
             for nla_strip_item in filter(lambda x: x.is_selected, pg.nla_strip_list):
-                export_sequence = PsaBuildSequence()
-                export_sequence.name = nla_strip_item.name
-                export_sequence.nla_state.action = None
-                export_sequence.nla_state.frame_start = nla_strip_item.frame_start
-                export_sequence.nla_state.frame_end = nla_strip_item.frame_end
-                export_sequence.fps = get_sequence_fps(context, pg.fps_source, pg.fps_custom, [nla_strip_item.action])
-                export_sequence.compression_ratio = nla_strip_item.action.psa_export.compression_ratio
-                export_sequence.key_quota = nla_strip_item.action.psa_export.key_quota
-                export_sequences.append(export_sequence)
+                action = nla_strip_item.action
+                action_psa_export = action.psa_export
+                export_sequences.append(PsaBuildSequence(
+                    name=nla_strip_item.name,
+                    nla_state=PsaBuildSequence.NlaState(None, nla_strip_item.frame_start, nla_strip_item.frame_end),
+                    fps=get_action_fps(action),
+                    compression_ratio=action_psa_export.compression_ratio,
+                    key_quota=action_psa_export.key_quota))
         else:
-            raise ValueError(f'Unhandled sequence source: {pg.sequence_source}')
+            raise ValueError(f'Unhandled sequence source: {sequence_source}')
 
         options = PsaBuildOptions()
         options.animation_data = animation_data
@@ -445,30 +542,17 @@ class PSA_OT_export_actions_select_all(Operator):
     bl_description = 'Select all visible sequences'
     bl_options = {'INTERNAL'}
 
-    @classmethod
-    def get_item_list(cls, context):
-        pg = context.scene.psa_export
-        if pg.sequence_source == 'ACTIONS':
-            return pg.action_list
-        elif pg.sequence_source == 'TIMELINE_MARKERS':
-            return pg.marker_list
-        elif pg.sequence_source == 'NLA_TRACK_STRIPS':
-            return pg.nla_strip_list
-        return None
-
     @classmethod
     def poll(cls, context):
         pg = getattr(context.scene, 'psa_export')
-        item_list = cls.get_item_list(context)
-        visible_sequences = get_visible_sequences(pg, item_list)
-        has_unselected_sequences = any(map(lambda item: not item.is_selected, visible_sequences))
-        return has_unselected_sequences
+        item_list = get_sequence_list(pg)
+        # Grey out the button when every visible sequence is already selected.
+        return any(not item.is_selected for item in iter_visible_sequences(pg, item_list))
 
     def execute(self, context):
         pg = getattr(context.scene, 'psa_export')
-        sequences = self.get_item_list(context)
-        for sequence in get_visible_sequences(pg, sequences):
-            sequence.is_selected = True
+        sequences = get_sequence_list(pg)
+        set_visible_sequences_is_selected(pg, sequences, True)
         return {'FINISHED'}
 
 
@@ -478,28 +562,17 @@ class PSA_OT_export_actions_deselect_all(Operator):
     bl_description = 'Deselect all visible sequences'
     bl_options = {'INTERNAL'}
 
-    @classmethod
-    def get_item_list(cls, context):
-        pg = context.scene.psa_export
-        if pg.sequence_source == 'ACTIONS':
-            return pg.action_list
-        elif pg.sequence_source == 'TIMELINE_MARKERS':
-            return pg.marker_list
-        elif pg.sequence_source == 'NLA_TRACK_STRIPS':
-            return pg.nla_strip_list
-        return None
-
     @classmethod
     def poll(cls, context):
-        item_list = cls.get_item_list(context)
-        has_selected_items = any(map(lambda item: item.is_selected, item_list))
-        return len(item_list) > 0 and has_selected_items
+        pg = getattr(context.scene, 'psa_export')
+        item_list = get_sequence_list(pg)
+        # Grey out the button when none of the visible sequences are selected.
+        return any(item.is_selected for item in iter_visible_sequences(pg, item_list))
 
     def execute(self, context):
         pg = getattr(context.scene, 'psa_export')
-        item_list = self.get_item_list(context)
-        for sequence in get_visible_sequences(pg, item_list):
-            sequence.is_selected = False
+        item_list = get_sequence_list(pg)
+        set_visible_sequences_is_selected(pg, item_list, False)
         return {'FINISHED'}
 
 
@@ -513,13 +586,11 @@ class PSA_OT_export_bone_collections_select_all(Operator):
     def poll(cls, context):
         pg = getattr(context.scene, 'psa_export')
         item_list = pg.bone_collection_list
-        has_unselected_items = any(map(lambda action: not action.is_selected, item_list))
-        return len(item_list) > 0 and has_unselected_items
+        return len(item_list) > 0 and any(not item.is_selected for item in item_list)
 
     def execute(self, context):
         pg = getattr(context.scene, 'psa_export')
-        for item in pg.bone_collection_list:
-            item.is_selected = True
+        pg.bone_collection_list.foreach_set('is_selected', [True] * len(pg.bone_collection_list))
         return {'FINISHED'}
 
 
@@ -533,13 +604,11 @@ class PSA_OT_export_bone_collections_deselect_all(Operator):
     def poll(cls, context):
         pg = getattr(context.scene, 'psa_export')
         item_list = pg.bone_collection_list
-        has_selected_actions = any(map(lambda action: action.is_selected, item_list))
-        return len(item_list) > 0 and has_selected_actions
+        return len(item_list) > 0 and any(item.is_selected for item in item_list)
 
     def execute(self, context):
         pg = getattr(context.scene, 'psa_export')
-        for action in pg.bone_collection_list:
-            action.is_selected = False
+        pg.bone_collection_list.foreach_set('is_selected', [False] * len(pg.bone_collection_list))
         return {'FINISHED'}
 
 
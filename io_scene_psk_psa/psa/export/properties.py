@@ -1,13 +1,15 @@
+import os
 import re
 import sys
-from fnmatch import fnmatch
-from typing import List, Optional
+from typing import List, Optional, Dict, Tuple
 
+import numpy as np
 from bpy.props import BoolProperty, PointerProperty, EnumProperty, FloatProperty, CollectionProperty, IntProperty, \
     StringProperty
 from bpy.types import PropertyGroup, Object, Action, AnimData, Context
 
-from ...shared.types import PSX_PG_bone_collection_list_item
+from ...shared.helpers import get_sequence_filter_name_matcher
+from ...shared.types import PSX_PG_bone_collection_list_item, BITFLAG_FILTER_ITEM
 
 
 def psa_export_property_group_animation_data_override_poll(_context, obj):
@@ -16,6 +18,35 @@ def psa_export_property_group_animation_data_override_poll(_context, obj):
 
 empty_set = set()
 
+# Matches the track index at the start of the items listed by `nla_track_search_cb` (e.g., `0 - NlaTrack`).
+NLA_TRACK_INDEX_PATTERN = re.compile(r'^(\d+)')
+
+# The filter flags of the sequences and the indices of the sequences that pass the filter, keyed by the property group
+# pointer and sequence source. Both are computed together so that they always describe the same list. This is cleared
+# whenever the filter settings or the contents of the sequence lists change.
+sequence_filter_cache: Dict[Tuple[int, str], Tuple[List[int], List[int]]] = dict()
+
+# The properties of the sequences that the filters look at, keyed by the property group pointer and sequence source.
+# Unlike the cache above, these only depend on the contents of the sequence lists, so they survive filter changes.
+# Both caches are also cleared when a file is loaded, since the pointers can be reused by the data of the loaded file.
+sequence_filter_columns_cache: Dict[Tuple[int, str], 'SequenceFilterColumns'] = dict()
+
+
+def clear_sequence_filter_caches():
+    sequence_filter_cache.clear()
+
+
+def clear_sequence_list_caches():
+    """
+    Clears all the cached data derived from the sequence lists. Call this whenever the contents of the lists change.
+    """
+    clear_sequence_filter_caches()
+    sequence_filter_columns_cache.clear()
+
+
+def sequence_filter_update_cb(self: 'PSA_PG_export', context: Context) -> None:
+    clear_sequence_filter_caches()
+
 
 class PSA_PG_export_action_list_item(PropertyGroup):
     action: PointerProperty(type=Action)
@@ -43,20 +74,25 @@ class PSA_PG_export_nla_strip_list_item(PropertyGroup):
 
 
 def nla_track_update_cb(self: 'PSA_PG_export', context: Context) -> None:
+    clear_sequence_list_caches()
     self.nla_strip_list.clear()
-    match = re.match(r'^(\d+).+$', self.nla_track)
+    match = NLA_TRACK_INDEX_PATTERN.match(self.nla_track)
     self.nla_track_index = int(match.group(1)) if match else -1
     if self.nla_track_index >= 0:
         animation_data = get_animation_data(self, context)
         if animation_data is None:
             return
         nla_track = animation_data.nla_tracks[self.nla_track_index]
-        for nla_strip in nla_track.strips:
-            strip: PSA_PG_export_nla_strip_list_item = self.nla_strip_list.add()
+        nla_strips = list(nla_track.strips)
+        # Pointer and string properties have to be assigned per item, but the frame ranges are written with foreach_set.
+        nla_strip_list = self.nla_strip_list
+        add_nla_strip_list_item = nla_strip_list.add
+        for nla_strip in nla_strips:
+            strip: PSA_PG_export_nla_strip_list_item = add_nla_strip_list_item()
             strip.action = nla_strip.action
             strip.name = nla_strip.name
-            strip.frame_start = nla_strip.frame_start
-            strip.frame_end = nla_strip.frame_end
+        nla_strip_list.foreach_set('frame_start', [x.frame_start for x in nla_strips])
+        nla_strip_list.foreach_set('frame_end', [x.frame_end for x in nla_strips])
 
 
 def get_animation_data(pg: 'PSA_PG_export', context: Context) -> Optional[AnimData]:
@@ -161,61 +197,122 @@ class PSA_PG_export(PropertyGroup):
         default='',
         name='Filter by Name',
         options={'TEXTEDIT_UPDATE'},
-        description='Only show items matching this name (use \'*\' as wildcard)')
+        description='Only show items matching this name (use \'*\' as wildcard)',
+        update=sequence_filter_update_cb)
     sequence_use_filter_invert: BoolProperty(
         default=False,
         name='Invert',
         options=empty_set,
-        description='Invert filtering (show hidden items, and vice versa)')
+        description='Invert filtering (show hidden items, and vice versa)',
+        update=sequence_filter_update_cb)
     sequence_filter_asset: BoolProperty(
         default=False,
         name='Show assets',
         options=empty_set,
-        description='Show actions that belong to an asset library')
+        description='Show actions that belong to an asset library',
+        update=sequence_filter_update_cb)
     sequence_filter_pose_marker: BoolProperty(
         default=True,
         name='Show pose markers',
-        options=empty_set)
+        options=empty_set,
+        update=sequence_filter_update_cb)
     sequence_use_filter_sort_reverse: BoolProperty(default=True, options=empty_set)
     sequence_filter_reversed: BoolProperty(
         default=True,
         options=empty_set,
         name='Show Reversed',
-        description='Show reversed sequences'
+        description='Show reversed sequences',
+        update=sequence_filter_update_cb
     )
 
 
+class SequenceFilterColumns:
+    """
+    The properties of the items of a sequence list that the filters look at, stored as one array per property.
+    Reading these from the sequence list is the slow part of filtering, so they are cached until the list changes.
+    Optional properties that the items of the list do not have are None.
+
+    Whether an action is an asset is not stored here, since it can change without the list changing.
+    """
+    __slots__ = ('names', 'is_pose_markers', 'is_reversed')
+
+    def __init__(self, sequences):
+        count = len(sequences)
+        self.names: List[str] = [os.path.normcase(x.name) for x in sequences]
+
+        # Every item in a sequence list is of the same type, so probe the first one for the optional properties once
+        # instead of checking every item.
+        first_sequence = sequences[0] if count > 0 else None
+        self.is_pose_markers: Optional[np.ndarray] = None
+        if hasattr(first_sequence, 'is_pose_marker'):
+            self.is_pose_markers = np.zeros(count, dtype=bool)
+            sequences.foreach_get('is_pose_marker', self.is_pose_markers)
+
+        frame_starts, frame_ends = [0] * count, [0] * count
+        sequences.foreach_get('frame_start', frame_starts)
+        sequences.foreach_get('frame_end', frame_ends)
+        self.is_reversed: np.ndarray = np.array(frame_starts) > np.array(frame_ends)
+
+
+def get_sequence_filter_columns(pg: PSA_PG_export, sequences) -> SequenceFilterColumns:
+    key = (pg.as_pointer(), pg.sequence_source)
+    columns = sequence_filter_columns_cache.get(key, None)
+    if columns is None or len(columns.names) != len(sequences):
+        columns = SequenceFilterColumns(sequences)
+        sequence_filter_columns_cache[key] = columns
+    return columns
+
+
 def filter_sequences(pg: PSA_PG_export, sequences) -> List[int]:
-    bitflag_filter_item = 1 << 30
-    flt_flags = [bitflag_filter_item] * len(sequences)
-
-    if pg.sequence_filter_name:
-        # Filter name is non-empty.
-        for i, sequence in enumerate(sequences):
-            if not fnmatch(sequence.name, f'*{pg.sequence_filter_name}*'):
-                flt_flags[i] &= ~bitflag_filter_item
-
-        # Invert filter flags for all items.
-        if pg.sequence_use_filter_invert:
-            for i, sequence in enumerate(sequences):
-                flt_flags[i] ^= bitflag_filter_item
-
-    if not pg.sequence_filter_asset:
-        for i, sequence in enumerate(sequences):
-            if hasattr(sequence, 'action') and sequence.action is not None and sequence.action.asset_data is not None:
-                flt_flags[i] &= ~bitflag_filter_item
-
-    if not pg.sequence_filter_pose_marker:
-        for i, sequence in enumerate(sequences):
-            if hasattr(sequence, 'is_pose_marker') and sequence.is_pose_marker:
-                flt_flags[i] &= ~bitflag_filter_item
-
-    if not pg.sequence_filter_reversed:
-        for i, sequence in enumerate(sequences):
-            if sequence.frame_start > sequence.frame_end:
-                flt_flags[i] &= ~bitflag_filter_item
-
-    return flt_flags
+    if len(sequences) == 0:
+        return []
+
+    match_filter_name = get_sequence_filter_name_matcher(pg.sequence_filter_name) if pg.sequence_filter_name else None
+    # Inverting the filter only applies to the name filter.
+    use_filter_invert = pg.sequence_use_filter_invert
+    columns = get_sequence_filter_columns(pg, sequences)
+    # Every item in a sequence list is of the same type, so only the first one needs to be checked for an action.
+    should_filter_assets = not pg.sequence_filter_asset and hasattr(sequences[0], 'action')
+    should_filter_pose_markers = not pg.sequence_filter_pose_marker and columns.is_pose_markers is not None
+    should_filter_reversed = not pg.sequence_filter_reversed
+
+    if match_filter_name is None and not (should_filter_assets or should_filter_pose_markers or should_filter_reversed):
+        # None of the filters are active, so every sequence is visible.
+        return [BITFLAG_FILTER_ITEM] * len(sequences)
+
+    # Only the name and asset filters have to look at the sequences one at a time. The other filters are combined over
+    # the whole of the cached columns at once.
+    if match_filter_name is not None:
+        is_visible = np.fromiter((bool(match_filter_name(name)) != use_filter_invert for name in columns.names),
+                                 dtype=bool, count=len(sequences))
+    else:
+        is_visible = np.ones(len(sequences), dtype=bool)
+    if should_filter_assets:
+        is_assets = np.fromiter((x.action is not None and x.action.asset_data is not None for x in sequences),
+                                dtype=bool, count=len(sequences))
+        is_visible &= ~is_assets
+    if should_filter_pose_markers:
+        is_visible &= ~columns.is_pose_markers
+    if should_filter_reversed:
+        is_visible &= ~columns.is_reversed
+
+    return np.where(is_visible, BITFLAG_FILTER_ITEM, 0).tolist()
+
+
+def get_sequence_filter(pg: PSA_PG_export, sequences) -> Tuple[List[int], List[int]]:
+    """
+    Returns the filter flags of the sequences in the sequence list of the current sequence source, along with the
+    indices of the sequences that pass the filter.
+    The result is cached until the filter settings or the sequence lists change, and must not be modified.
+    """
+    key = (pg.as_pointer(), pg.sequence_source)
+    entry = sequence_filter_cache.get(key, None)
+    if entry is None or len(entry[0]) != len(sequences):
+        flt_flags = filter_sequences(pg, sequences)
+        visible_indices = np.flatnonzero(np.array(flt_flags, dtype=np.int32) & BITFLAG_FILTER_ITEM).tolist()
+        entry = (flt_flags, visible_indices)
+        sequence_filter_cache[key] = entry
+    return entry
 
 
 classes = (
@@ -1,8 +1,6 @@
-from typing import cast
-
 from bpy.types import UIList
 
-from .properties import PSA_PG_export_action_list_item, filter_sequences
+from .properties import PSA_PG_export_action_list_item, get_sequence_filter
 
 
 class PSA_UL_export_sequences(UIList):
@@ -12,8 +10,7 @@ class PSA_UL_export_sequences(UIList):
         # Show the filtering options by default.
         self.use_filter_show = True
 
-    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
-        item = cast(PSA_PG_export_action_list_item, item)
+    def draw_item(self, context, layout, data, item: PSA_PG_export_action_list_item, icon, active_data, active_propname, index):
         is_pose_marker = hasattr(item, 'is_pose_marker') and item.is_pose_marker
         layout.prop(item, 'is_selected', icon_only=True, text=item.name)
         if hasattr(item, 'action') and item.action is not None and item.action.asset_data is not None:
@@ -42,8 +39,9 @@ class PSA_UL_export_sequences(UIList):
     def filter_items(self, context, data, prop):
         pg = getattr(context.scene, 'psa_export')
         actions = getattr(data, prop)
-        flt_flags = filter_sequences(pg, actions)
-        flt_neworder = list(range(len(actions)))
+        flt_flags, _ = get_sequence_filter(pg, actions)
+        # An empty list means that the items are displayed in their original order.
+        flt_neworder = []
         return flt_flags, flt_neworder
 
 
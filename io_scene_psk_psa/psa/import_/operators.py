@@ -58,8 +58,7 @@ class PSA_OT_import_sequences_select_all(Operator):
     def poll(cls, context):
         pg = getattr(context.scene, 'psa_import')
         visible_sequences = get_visible_sequences(pg, pg.sequence_list)
-        has_unselected_actions = any(map(lambda action: not action.is_selected, visible_sequences))
-        return len(visible_sequences) > 0 and has_unselected_actions
+        return any(not sequence.is_selected for sequence in visible_sequences)
 
     def execute(self, context):
         pg = getattr(context.scene, 'psa_import')
@@ -79,8 +78,7 @@ class PSA_OT_import_sequences_deselect_all(Operator):
     def poll(cls, context):
         pg = getattr(context.scene, 'psa_import')
         visible_sequences = get_visible_sequences(pg, pg.sequence_list)
-        has_selected_sequences = any(map(lambda sequence: sequence.is_selected, visible_sequences))
-        return len(visible_sequences) > 0 and has_selected_sequences
+        return any(sequence.is_selected for sequence in visible_sequences)
 
     def execute(self, context):
         pg = getattr(context.scene, 'psa_import')
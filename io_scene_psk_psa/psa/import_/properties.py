@@ -1,11 +1,14 @@
+import os
 import re
-from fnmatch import fnmatch
 from typing import List
 
 from bpy.props import StringProperty, BoolProperty, CollectionProperty, IntProperty, PointerProperty, EnumProperty, \
     FloatProperty
 from bpy.types import PropertyGroup, Text
 
+from ...shared.helpers import get_sequence_filter_name_matcher
+from ...shared.types import BITFLAG_FILTER_ITEM
+
 empty_set = set()
 
 
@@ -111,8 +114,7 @@ class PSA_PG_import(PropertyGroup):
 
 
 def filter_sequences(pg: PSA_PG_import, sequences) -> List[int]:
-    bitflag_filter_item = 1 << 30
-    flt_flags = [bitflag_filter_item] * len(sequences)
+    flt_flags = [BITFLAG_FILTER_ITEM] * len(sequences)
 
     if pg.sequence_filter_name is not None:
         # Filter name is non-empty.
@@ -122,35 +124,31 @@ def filter_sequences(pg: PSA_PG_import, sequences) -> List[int]:
                 regex = re.compile(pg.sequence_filter_name)
                 for i, sequence in enumerate(sequences):
                     if not regex.match(sequence.action_name):
-                        flt_flags[i] &= ~bitflag_filter_item
+                        flt_flags[i] &= ~BITFLAG_FILTER_ITEM
             except re.error:
                 pass
         else:
             # User regular text matching.
+            match_filter_name = get_sequence_filter_name_matcher(pg.sequence_filter_name)
             for i, sequence in enumerate(sequences):
-                if not fnmatch(sequence.action_name, f'*{pg.sequence_filter_name}*'):
-                    flt_flags[i] &= ~bitflag_filter_item
+                if not match_filter_name(os.path.normcase(sequence.action_name)):
+                    flt_flags[i] &= ~BITFLAG_FILTER_ITEM
 
     if pg.sequence_filter_is_selected:
         for i, sequence in enumerate(sequences):
             if not sequence.is_selected:
-                flt_flags[i] &= ~bitflag_filter_item
+                flt_flags[i] &= ~BITFLAG_FILTER_ITEM
 
     if pg.sequence_use_filter_invert:
         # Invert filter flags for all items.
         for i, sequence in enumerate(sequences):
-            flt_flags[i] ^= bitflag_filter_item
+            flt_flags[i] ^= BITFLAG_FILTER_ITEM
 
     return flt_flags
 
 
 def get_visible_sequences(pg: PSA_PG_import, sequences) -> List[PSA_PG_import_action_list_item]:
-    bitflag_filter_item = 1 << 30
-    visible_sequences = []
-    for i, flag in enumerate(filter_sequences(pg, sequences)):
-        if bool(flag & bitflag_filter_item):
-            visible_sequences.append(sequences[i])
-    return visible_sequences
+    return [sequences[i] for i, flag in enumerate(filter_sequences(pg, sequences)) if flag & BITFLAG_FILTER_ITEM]
 
 
 classes = (
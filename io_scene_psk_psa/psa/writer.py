@@ -13,8 +13,8 @@ def write_section(fp, name: bytes, data_type: Type[Structure] = None, data: list
         section.data_count = len(data)
     fp.write(section)
     if data is not None:
-        for datum in data:
-            fp.write(datum)
+        # Join the structures into a single buffer so that the whole section is written in one call.
+        fp.write(b''.join(data))
 
 
 def write_psa(psa: Psa, path: str):
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 import bpy
 from bpy.props import StringProperty, BoolProperty, EnumProperty
@@ -12,9 +12,7 @@ from ..writer import write_psk
 from ...shared.helpers import populate_bone_collection_list
 
 
-def is_bone_filter_mode_item_available(context, identifier):
-    input_objects = get_psk_input_objects_for_context(context)
-    armature_object = input_objects.armature_object
+def is_bone_filter_mode_item_available(armature_object: Optional[Object], identifier: str):
     if identifier == 'BONE_COLLECTIONS':
         if armature_object is None or armature_object.data is None or len(armature_object.data.collections) == 0:
             return False
@@ -224,12 +222,14 @@ class PSK_OT_export(Operator, ExportHelper):
         bones_header.label(text='Bones', icon='BONE_DATA')
         if bones_panel:
             bone_filter_mode_items = pg.bl_rna.properties['bone_filter_mode'].enum_items_static
+            # Gather the input objects once rather than re-scanning the selected objects for every enum item.
+            armature_object = get_psk_input_objects_for_context(context).armature_object
             row = bones_panel.row(align=True)
             for item in bone_filter_mode_items:
                 identifier = item.identifier
                 item_layout = row.row(align=True)
                 item_layout.prop_enum(pg, 'bone_filter_mode', item.identifier)
-                item_layout.enabled = is_bone_filter_mode_item_available(context, identifier)
+                item_layout.enabled = is_bone_filter_mode_item_available(armature_object, identifier)
 
             if pg.bone_filter_mode == 'BONE_COLLECTIONS':
                 row = bones_panel.row()
@@ -19,8 +19,8 @@ def _write_section(fp, name: bytes, data_type: Type[Structure] = None, data: lis
         section.data_count = len(data)
     fp.write(section)
     if data is not None:
-        for datum in data:
-            fp.write(datum)
+        # Join the structures into a single buffer so that the whole section is written in one call.
+        fp.write(b''.join(data))
 
 
 def write_psk(psk: Psk, path: str):
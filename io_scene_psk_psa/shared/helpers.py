@@ -1,9 +1,14 @@
+import os
 import re
 import typing
-from typing import List, Iterable
+from fnmatch import translate
+from functools import lru_cache
+from operator import itemgetter
+from typing import List, Iterable, Tuple, Optional, Set, Callable, Any
 
 import bpy.types
-from bpy.types import NlaStrip, Object, AnimData
+import numpy as np
+from bpy.types import NlaTrack, Object, AnimData, Action
 
 
 def rgb_to_srgb(c: float):
@@ -13,19 +18,80 @@ def rgb_to_srgb(c: float):
         return 12.92 * c
 
 
-def get_nla_strips_in_frame_range(animation_data: AnimData, frame_min: float, frame_max: float) -> List[NlaStrip]:
+def get_unmuted_nla_tracks(animation_data: AnimData) -> List[NlaTrack]:
     if animation_data is None:
         return []
-    strips = []
-    for nla_track in animation_data.nla_tracks:
-        if nla_track.mute:
-            continue
-        for strip in nla_track.strips:
-            if (strip.frame_start < frame_min and strip.frame_end > frame_max) or \
-                    (frame_min <= strip.frame_start < frame_max) or \
-                    (frame_min < strip.frame_end <= frame_max):
-                strips.append(strip)
-    return strips
+    return [nla_track for nla_track in animation_data.nla_tracks if not nla_track.mute]
+
+
+class NlaStripFrameRangeIndex:
+    """
+    The frame ranges and actions of the strips of a set of NLA tracks, stored as parallel arrays sorted by start frame.
+
+    Every strip that overlaps a frame range starts no later than the end of that range (a zero-length strip can sit right
+    on it), so a query only needs to look at the strips up to the end of the range, which are found with a binary
+    search. A strip is in a frame range if it spans the whole range, or if its start or end frame falls within it.
+    """
+    def __init__(self, nla_tracks: Iterable[NlaTrack]):
+        strips = [(strip.frame_start, strip.frame_end, strip) for nla_track in nla_tracks for strip in nla_track.strips]
+        strips.sort(key=itemgetter(0))
+        self.frame_starts = np.array([x[0] for x in strips], dtype=np.float64)
+        self.frame_ends = np.array([x[1] for x in strips], dtype=np.float64)
+        self.actions: List[Action] = [x[2].action for x in strips]
+
+    def _get_candidate_count(self, frame_max: float) -> int:
+        return int(np.searchsorted(self.frame_starts, frame_max, side='right'))
+
+    def _get_frame_range_mask(self, frame_min: float, frame_max: float) -> np.ndarray:
+        """
+        Returns a mask over the first strips (up to the candidate count for the frame range) that are in the frame
+        range.
+        """
+        # A reversed frame range only matches strips that span it, which can start anywhere before its start.
+        count = self._get_candidate_count(max(frame_min, frame_max))
+        frame_starts = self.frame_starts[:count]
+        frame_ends = self.frame_ends[:count]
+        return ((frame_starts < frame_min) & (frame_ends > frame_max)) | \
+            ((frame_min <= frame_starts) & (frame_starts < frame_max)) | \
+            ((frame_min < frame_ends) & (frame_ends <= frame_max))
+
+    def get_frame_range_extents(self, frame_min: float, frame_max: float) -> Optional[Tuple[float, float]]:
+        """
+        Returns the earliest start frame and the latest end frame of the strips in the frame range, or None if there
+        are no strips in the frame range.
+        """
+        mask = self._get_frame_range_mask(frame_min, frame_max)
+        if not mask.any():
+            return None
+        count = len(mask)
+        return float(self.frame_starts[:count][mask].min()), float(self.frame_ends[:count][mask].max())
+
+    def get_actions_in_frame_range(self, frame_min: float, frame_max: float) -> Set[Action]:
+        """
+        Returns the actions of the strips in the frame range.
+        """
+        mask = self._get_frame_range_mask(frame_min, frame_max)
+        return {self.actions[i] for i in np.flatnonzero(mask).tolist()}
+
+
+@lru_cache(maxsize=64)
+def get_sequence_filter_name_matcher(filter_name: str) -> Callable[[str], Any]:
+    """
+    Returns a function for matching (normcase'd) sequence names against the name filter. The result of the function is
+    truthy if the name matches.
+    This matches the same names as `fnmatch(name, f'*{filter_name}*')`, but the glob is only translated and compiled
+    once instead of for every sequence.
+    """
+    filter_name = os.path.normcase(filter_name)
+    if not any(c in filter_name for c in '*?['):
+        # The filter is a plain substring (the common case), so no pattern matching is needed.
+        return lambda name: filter_name in name
+    if '[' not in filter_name:
+        # Without character sets, the only wildcards are `*` and `?`, which can be swapped in for their escaped forms
+        # directly instead of going through the general purpose glob translation.
+        pattern = re.escape(filter_name).replace(r'\*', '.*').replace(r'\?', '.')
+        return re.compile(pattern, re.DOTALL).search
+    return re.compile(translate(f'*{filter_name}*')).match
 
 
 def populate_bone_collection_list(armature_object: Object, bone_collection_list: bpy.props.CollectionProperty) -> None:
@@ -1,6 +1,9 @@
 from bpy.props import StringProperty, IntProperty, BoolProperty, FloatProperty
 from bpy.types import PropertyGroup, UIList, UILayout, Context, AnyType, Panel
 
+# The flag that marks an item as visible in the flags returned by `UIList.filter_items`.
+BITFLAG_FILTER_ITEM = 1 << 30
+
 
 class PSX_UL_bone_collection_list(UIList):
 